@@ -1,5 +1,6 @@
 """Graph data model subsystem."""
 
+from prosim.graph.compiled import CompiledWorkflow, compile_workflow
 from prosim.graph.models import (
     EdgeType,
     Node,
@@ -17,6 +18,8 @@ from prosim.graph.operations import (
 from prosim.graph.serialization import graph_from_json, graph_to_json
 
 __all__ = [
+    "CompiledWorkflow",
+    "compile_workflow",
     "EdgeType",
     "Node",
     "Edge",
@@ -0,0 +1,195 @@
+"""Cached, array-based view of a workflow's topology for the simulation engines."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+import numpy as np
+from scipy import sparse
+
+from prosim.graph.models import Edge, EdgeType, Node, NodeType, WorkflowGraph
+from prosim.graph.operations import topological_execution_order
+
+# Hashable summary of everything the compiled form depends on:
+# (node ids, node types, edges as (source, target, edge_type, probability))
+_TopologyKey = tuple[
+    tuple[str, ...],
+    tuple[NodeType, ...],
+    tuple[tuple[str, str, EdgeType, float], ...],
+]
+
+
+@dataclass(frozen=True)
+class CompiledWorkflow:
+    """Immutable index/CSR representation of a workflow's structure.
+
+    Nodes are addressed by their position in ``workflow.nodes``. Edges are
+    stored CSR-style in both directions: the edges leaving node ``i`` are
+    ``out_target[out_ptr[i]:out_ptr[i + 1]]`` (with ``out_prob``), and the
+    edges entering it are ``in_source[in_ptr[i]:in_ptr[i + 1]]`` (with
+    ``in_prob``). Edge endpoints that do not reference a known node are
+    encoded as ``-1``. All arrays are read-only, since instances are shared
+    through a cache.
+
+    ``out_cumprob`` holds, per source node, the running sum of its outgoing
+    probabilities normalized so the last entry is exactly 1, ready for
+    inverse-CDF branch sampling (``searchsorted(cumprob, u, side="right")``).
+    Rows whose probabilities sum to zero are all ones, so sampling falls
+    back to the first edge.
+
+    ``forward`` is the ``(n, n)`` sparse matrix of edge probabilities
+    restricted to edges that point forward in ``topo_order`` (row = target,
+    column = source); back edges that close loops are excluded.
+    ``level_groups`` partitions the nodes into topological levels over
+    those forward edges, so every node's forward predecessors sit in
+    earlier groups. ``forward`` must be treated as read-only as well.
+
+    Only topology is captured here; node parameters are read from the
+    workflow by each engine, so parameter tweaks never invalidate the cache.
+    """
+
+    node_ids: tuple[str, ...]
+    node_types: tuple[NodeType, ...]
+    index: Mapping[str, int]
+    topo_order: np.ndarray
+    start_idx: np.ndarray
+    end_idx: np.ndarray
+    out_ptr: np.ndarray
+    out_target: np.ndarray
+    out_prob: np.ndarray
+    out_cumprob: np.ndarray
+    in_ptr: np.ndarray
+    in_source: np.ndarray
+    in_prob: np.ndarray
+    forward: sparse.csr_matrix
+    level_groups: tuple[np.ndarray, ...]
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+
+def _topology_key(workflow: WorkflowGraph) -> _TopologyKey:
+    return (
+        tuple(n.id for n in workflow.nodes),
+        tuple(n.node_type for n in workflow.nodes),
+        tuple((e.source, e.target, e.edge_type, e.probability) for e in workflow.edges),
+    )
+
+
+def _readonly(values: list, dtype: type) -> np.ndarray:
+    arr = np.array(values, dtype=dtype)
+    arr.setflags(write=False)
+    return arr
+
+
+def _csr(
+    n_nodes: int, pairs: list[tuple[int, int, float]]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Group ``(row, col, prob)`` triples by row, preserving input order."""
+    rows: list[list[tuple[int, float]]] = [[] for _ in range(n_nodes)]
+    for row, col, prob in pairs:
+        rows[row].append((col, prob))
+    ptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    ptr[1:] = np.cumsum([len(r) for r in rows])
+    ptr.setflags(write=False)
+    flat = [entry for r in rows for entry in r]
+    return ptr, _readonly([c for c, _ in flat], np.int64), _readonly([p for _, p in flat], np.float64)
+
+
+@lru_cache(maxsize=32)
+def _compile_topology(key: _TopologyKey) -> CompiledWorkflow:
+    node_ids, node_types, edges = key
+    n_nodes = len(node_ids)
+    index = {nid: i for i, nid in enumerate(node_ids)}
+
+    out_pairs = []
+    in_pairs = []
+    for source, target, _edge_type, prob in edges:
+        src = index.get(source, -1)
+        tgt = index.get(target, -1)
+        if src >= 0:
+            out_pairs.append((src, tgt, prob))
+        if tgt >= 0:
+            in_pairs.append((tgt, src, prob))
+    out_ptr, out_target, out_prob = _csr(n_nodes, out_pairs)
+    in_ptr, in_source, in_prob = _csr(n_nodes, in_pairs)
+
+    out_cumprob = np.ones_like(out_prob)
+    for i in range(n_nodes):
+        lo, hi = out_ptr[i], out_ptr[i + 1]
+        total = out_prob[lo:hi].sum()
+        if hi - lo > 1 and total > 0:
+            out_cumprob[lo:hi - 1] = np.cumsum(out_prob[lo:hi - 1]) / total
+    out_cumprob.setflags(write=False)
+
+    # Reuse the canonical ordering (loop edges removed, remaining cycles broken)
+    skeleton = WorkflowGraph.model_construct(
+        name="",
+        nodes=[
+            Node.model_construct(id=nid, name=nid, node_type=ntype)
+            for nid, ntype in zip(node_ids, node_types)
+        ],
+        edges=[
+            Edge.model_construct(source=s, target=t, edge_type=et, probability=p)
+            for s, t, et, p in edges
+        ],
+    )
+    topo = [index[nid] for nid in topological_execution_order(skeleton) if nid in index]
+
+    # Forward edges (source strictly earlier in topo order) and their levels
+    position = np.full(n_nodes, n_nodes, dtype=np.int64)
+    position[topo] = np.arange(len(topo))
+    rows, cols, probs = [], [], []
+    for source, target, _edge_type, prob in edges:
+        src = index.get(source, -1)
+        tgt = index.get(target, -1)
+        if src >= 0 and tgt >= 0 and position[src] < position[tgt]:
+            rows.append(tgt)
+            cols.append(src)
+            probs.append(prob)
+    forward = sparse.csr_matrix((probs, (rows, cols)), shape=(n_nodes, n_nodes))
+
+    level = np.zeros(n_nodes, dtype=np.int64)
+    for v in topo:
+        preds = forward.indices[forward.indptr[v]:forward.indptr[v + 1]]
+        if preds.size:
+            level[v] = level[preds].max() + 1
+    topo_arr = np.array(topo, dtype=np.int64)
+    level_groups = tuple(
+        _readonly(topo_arr[level[topo_arr] == k].tolist(), np.int64)
+        for k in range(int(level[topo_arr].max()) + 1 if topo else 0)
+    )
+
+    return CompiledWorkflow(
+        node_ids=node_ids,
+        node_types=node_types,
+        index=MappingProxyType(index),
+        topo_order=_readonly(topo, np.int64),
+        start_idx=_readonly([i for i, t in enumerate(node_types) if t == NodeType.START], np.int64),
+        end_idx=_readonly([i for i, t in enumerate(node_types) if t == NodeType.END], np.int64),
+        out_ptr=out_ptr,
+        out_target=out_target,
+        out_prob=out_prob,
+        out_cumprob=out_cumprob,
+        in_ptr=in_ptr,
+        in_source=in_source,
+        in_prob=in_prob,
+        forward=forward,
+        level_groups=level_groups,
+    )
+
+
+def compile_workflow(workflow: WorkflowGraph) -> CompiledWorkflow:
+    """Return the compiled topology of ``workflow``, reusing a cached copy when possible.
+
+    The cache is keyed on the workflow's structure (node ids/types and
+    edges), not on object identity, so in-place edits to the graph are
+    always picked up while repeated runs over the same topology — parameter
+    sweeps, sensitivity analysis, intervention what-ifs — skip rebuilding
+    the NetworkX graph and topological sort.
+    """
+    return _compile_topology(_topology_key(workflow))
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import logging
+import re
+from typing import Any
+
 import networkx as nx
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
 
 from prosim.graph.models import (
     Edge,
@@ -14,6 +19,15 @@ from prosim.graph.models import (
 )
 from prosim.graph.operations import build_nx_graph, normalize_decision_probabilities, validate_graph
 
+logger = logging.getLogger(__name__)
+
+# Field values shared by every edge the repair steps synthesize; such edges are
+# built from already-validated node IDs, so they skip model validation.
+_EDGE_DEFAULTS = {"edge_type": EdgeType.NORMAL, "probability": 1.0, "condition": ""}
+
+# Validation issues that make a generated workflow unusable in strict mode
+_CRITICAL_RE = re.compile(r"no start node|no end node|orphaned|not weakly connected", re.IGNORECASE)
+
 
 def _normalize_id_for_match(s: str) -> str:
     """Normalize ID for fuzzy matching (lowercase, hyphens/underscores)."""
@@ -40,17 +54,13 @@ def _infer_linear_chain(
     edges = []
     prev = start_nodes[0].id
     for node in process_nodes:
-        edges.append(
-            Edge(source=prev, target=node.id, edge_type=EdgeType.NORMAL, probability=1.0)
-        )
+        edges.append(Edge.model_construct(source=prev, target=node.id, **_EDGE_DEFAULTS))
         prev = node.id
-    edges.append(
-        Edge(source=prev, target=end_nodes[0].id, edge_type=EdgeType.NORMAL, probability=1.0)
-    )
+    edges.append(Edge.model_construct(source=prev, target=end_nodes[0].id, **_EDGE_DEFAULTS))
     return edges
 
 
-def _repair_edges(nodes: list[Node], raw_edges: list[dict]) -> list[Edge]:
+def _repair_edges(nodes: list[Node], raw_edges: list[RawEdge]) -> list[Edge]:
     """Repair edges: fix invalid source/target references, infer linear chain if empty."""
     node_ids = {n.id for n in nodes}
     start_nodes = [n for n in nodes if n.node_type == NodeType.START]
@@ -67,20 +77,21 @@ def _repair_edges(nodes: list[Node], raw_edges: list[dict]) -> list[Edge]:
     # Repair edges with invalid source/target
     repaired = []
     for raw_edge in raw_edges:
-        src = raw_edge.get("source", "")
-        tgt = raw_edge.get("target", "")
+        src = raw_edge.source
+        tgt = raw_edge.target
         if not src or not tgt:
             continue
         fixed_src = _find_matching_node_id(src, node_ids) or src
         fixed_tgt = _find_matching_node_id(tgt, node_ids) or tgt
         if fixed_src in node_ids and fixed_tgt in node_ids:
+            # Field values were already validated by RawEdge
             repaired.append(
-                Edge(
+                Edge.model_construct(
                     source=fixed_src,
                     target=fixed_tgt,
-                    edge_type=EdgeType(raw_edge.get("edge_type", "normal")),
-                    probability=raw_edge.get("probability", 1.0),
-                    condition=raw_edge.get("condition", ""),
+                    edge_type=raw_edge.edge_type,
+                    probability=raw_edge.probability,
+                    condition=raw_edge.condition,
                 )
             )
 
@@ -103,8 +114,9 @@ def _repair_connectivity(workflow: WorkflowGraph) -> WorkflowGraph:
         return workflow
 
     components = list(nx.weakly_connected_components(G))
-    start_ids = {n.id for n in workflow.get_start_nodes()}
-    end_ids = {n.id for n in workflow.get_end_nodes()}
+    # Computed once and shared by the component classification and bridge selection below
+    start_ids = frozenset(n.id for n in workflow.nodes if n.node_type == NodeType.START)
+    end_ids = frozenset(n.id for n in workflow.nodes if n.node_type == NodeType.END)
 
     # Find main component (has start and end) and orphans
     main_component = None
@@ -142,17 +154,12 @@ def _repair_connectivity(workflow: WorkflowGraph) -> WorkflowGraph:
                 o_G = G.subgraph(o)
                 o_first = next((n for n in o if o_G.in_degree(n) == 0), next(iter(o)))
                 o_last = next((n for n in o if o_G.out_degree(n) == 0), next(iter(o)))
-                new_edges.append(Edge(source=prev, target=o_first, edge_type=EdgeType.NORMAL, probability=1.0))
+                new_edges.append(Edge.model_construct(source=prev, target=o_first, **_EDGE_DEFAULTS))
                 prev = o_last
-            new_edges.append(Edge(source=prev, target=end_first, edge_type=EdgeType.NORMAL, probability=1.0))
+            new_edges.append(Edge.model_construct(source=prev, target=end_first, **_EDGE_DEFAULTS))
         else:
-            new_edges.append(Edge(source=start_last, target=end_first, edge_type=EdgeType.NORMAL, probability=1.0))
-        return WorkflowGraph(
-            name=workflow.name,
-            description=workflow.description,
-            nodes=workflow.nodes,
-            edges=new_edges,
-        )
+            new_edges.append(Edge.model_construct(source=start_last, target=end_first, **_EDGE_DEFAULTS))
+        return workflow.model_copy(update={"edges": new_edges})
 
     if not main_component or not orphan_components:
         return workflow
@@ -162,7 +169,13 @@ def _repair_connectivity(workflow: WorkflowGraph) -> WorkflowGraph:
     if not end_node:
         return workflow
 
-    nodes_into_end = [e.source for e in workflow.edges if e.target == end_node]
+    # Single pass over the edge list: predecessor map keyed by target, holding edge indices
+    preds: dict[str, list[int]] = {}
+    for idx, e in enumerate(workflow.edges):
+        preds.setdefault(e.target, []).append(idx)
+
+    into_end = preds.get(end_node, [])
+    nodes_into_end = [workflow.edges[idx].source for idx in into_end]
     # Prefer a non-start node; otherwise use start
     bridge_from = next(
         (n for n in nodes_into_end if n in main_component and n not in start_ids),
@@ -172,10 +185,8 @@ def _repair_connectivity(workflow: WorkflowGraph) -> WorkflowGraph:
         return workflow
 
     # Remove the edge bridge_from -> end_node; we'll replace it with a chain through orphans
-    new_edges = [
-        e for e in workflow.edges
-        if not (e.source == bridge_from and e.target == end_node)
-    ]
+    dropped = {idx for idx in into_end if workflow.edges[idx].source == bridge_from}
+    new_edges = [e for idx, e in enumerate(workflow.edges) if idx not in dropped]
 
     # Chain orphans: bridge_from -> o1_first -> ... -> o1_last -> o2_first -> ... -> o2_last -> end
     for i, orphan in enumerate(orphan_components):
@@ -187,26 +198,114 @@ def _repair_connectivity(workflow: WorkflowGraph) -> WorkflowGraph:
         first_node = entries[0] if entries else next(iter(orphan))
         last_node = exits[0] if exits else next(iter(orphan))
 
-        new_edges.append(Edge(source=bridge_from, target=first_node, edge_type=EdgeType.NORMAL, probability=1.0))
+        new_edges.append(Edge.model_construct(source=bridge_from, target=first_node, **_EDGE_DEFAULTS))
         if i == len(orphan_components) - 1:
-            new_edges.append(Edge(source=last_node, target=end_node, edge_type=EdgeType.NORMAL, probability=1.0))
+            new_edges.append(Edge.model_construct(source=last_node, target=end_node, **_EDGE_DEFAULTS))
         else:
             next_orphan = orphan_components[i + 1]
             next_G = G.subgraph(next_orphan)
             next_entries = [n for n in next_orphan if next_G.in_degree(n) == 0]
             next_first = next_entries[0] if next_entries else next(iter(next_orphan))
-            new_edges.append(Edge(source=last_node, target=next_first, edge_type=EdgeType.NORMAL, probability=1.0))
+            new_edges.append(Edge.model_construct(source=last_node, target=next_first, **_EDGE_DEFAULTS))
         bridge_from = last_node
 
-    return WorkflowGraph(
-        name=workflow.name,
-        description=workflow.description,
-        nodes=workflow.nodes,
-        edges=new_edges,
-    )
+    return workflow.model_copy(update={"edges": new_edges})
+
+
+# ---------------------------------------------------------------------------
+# Raw tool_use schema
+# ---------------------------------------------------------------------------
+
+# Flat per-node parameters accepted from the generate_workflow tool schema
+_RAW_PARAM_FIELDS = (
+    "exec_time_mean",
+    "exec_time_variance",
+    "cost_per_transaction",
+    "error_rate",
+    "drop_off_rate",
+    "queue_delay_mean",
+    "capacity_per_hour",
+    "max_retries",
+    "retry_delay",
+    "parallelization_factor",
+)
+
+
+class RawNode(BaseModel):
+    """A node as emitted by Claude: flat parameters, defaults applied during validation."""
+
+    id: str
+    name: str
+    node_type: NodeType
+    description: str = ""
+    params: NodeParams
+
+    @model_validator(mode="before")
+    @classmethod
+    def collect_params(cls, data: Any) -> Any:
+        """Gather the flat parameter keys into a nested NodeParams payload."""
+        if isinstance(data, dict) and "params" not in data:
+            node_type = data.get("node_type", "api")
+            params = {k: data[k] for k in _RAW_PARAM_FIELDS if k in data}
+            params.setdefault("exec_time_mean", _default_time(getattr(node_type, "value", node_type)))
+            data = {**data, "params": params}
+        return data
+
+    @field_validator("id")
+    @classmethod
+    def id_must_be_nonempty(cls, v: str) -> str:
+        """Validate that node ID is non-empty."""
+        if not v.strip():
+            raise ValueError("Node ID must be non-empty")
+        return v.strip()
+
+    def to_node(self) -> Node:
+        """Convert to a Node without re-running validation."""
+        return Node.model_construct(
+            id=self.id,
+            name=self.name,
+            node_type=self.node_type,
+            description=self.description,
+            params=self.params,
+        )
+
+
+class RawEdge(BaseModel):
+    """An edge as emitted by Claude; endpoints may not match node IDs yet."""
+
+    source: str = ""
+    target: str = ""
+    edge_type: EdgeType = EdgeType.NORMAL
+    probability: float = Field(default=1.0, ge=0, le=1)
+    condition: str = ""
 
 
-def postprocess_raw_workflow(raw: dict, strict: bool = False) -> WorkflowGraph:
+class RawWorkflow(BaseModel):
+    """Complete generate_workflow tool output."""
+
+    name: str = "Unnamed Workflow"
+    description: str = ""
+    nodes: list[RawNode] = Field(default_factory=list)
+    edges: list[RawEdge] = Field(default_factory=list)
+
+    def to_workflow(self) -> WorkflowGraph:
+        """Build the WorkflowGraph, applying edge repair, probability
+        normalization and connectivity repair."""
+        nodes = [n.to_node() for n in self.nodes]
+        workflow = WorkflowGraph.model_construct(
+            name=self.name,
+            description=self.description,
+            nodes=nodes,
+            edges=_repair_edges(nodes, self.edges),
+        )
+        workflow = normalize_decision_probabilities(workflow)
+        return _repair_connectivity(workflow)
+
+
+RAW_ADAPTER = TypeAdapter(RawWorkflow)
+
+
+def postprocess_raw_workflow(raw: dict | str | bytes, strict: bool = False) -> WorkflowGraph:
     """Convert raw Claude API output into a validated WorkflowGraph.
 
     Handles:
@@ -217,63 +316,25 @@ def postprocess_raw_workflow(raw: dict, strict: bool = False) -> WorkflowGraph:
     - Normalizing decision probabilities
     - Validating graph structure
 
+    All per-element parsing and defaulting happens in a single RAW_ADAPTER
+    validation pass; the repaired graph is assembled without re-validation.
+
     Args:
-        raw: Raw dict from Claude API tool_use output.
+        raw: Raw dict from Claude API tool_use output, or the same payload as JSON.
         strict: If True, raise ValueError on critical validation issues.
     """
-    nodes = []
-    for raw_node in raw.get("nodes", []):
-        params = NodeParams(
-            exec_time_mean=raw_node.get("exec_time_mean", _default_time(raw_node.get("node_type", "api"))),
-            exec_time_variance=raw_node.get("exec_time_variance", 0.1),
-            cost_per_transaction=raw_node.get("cost_per_transaction", 0.0),
-            error_rate=raw_node.get("error_rate", 0.0),
-            drop_off_rate=raw_node.get("drop_off_rate", 0.0),
-            queue_delay_mean=raw_node.get("queue_delay_mean", 0.0),
-            capacity_per_hour=raw_node.get("capacity_per_hour"),
-            max_retries=raw_node.get("max_retries", 0),
-            retry_delay=raw_node.get("retry_delay", 0.0),
-            parallelization_factor=raw_node.get("parallelization_factor", 1),
-        )
-
-        node = Node(
-            id=raw_node["id"],
-            name=raw_node["name"],
-            node_type=NodeType(raw_node["node_type"]),
-            description=raw_node.get("description", ""),
-            params=params,
-        )
-        nodes.append(node)
-
-    raw_edges = raw.get("edges", [])
-    edges = _repair_edges(nodes, raw_edges)
-
-    workflow = WorkflowGraph(
-        name=raw.get("name", "Unnamed Workflow"),
-        description=raw.get("description", ""),
-        nodes=nodes,
-        edges=edges,
-    )
-
-    # Normalize decision probabilities
-    workflow = normalize_decision_probabilities(workflow)
-
-    # Repair disconnected components
-    workflow = _repair_connectivity(workflow)
+    if isinstance(raw, (str, bytes)):
+        parsed = RAW_ADAPTER.validate_json(raw)
+    else:
+        parsed = RAW_ADAPTER.validate_python(raw)
+    workflow = parsed.to_workflow()
 
     # Validate
     issues = validate_graph(workflow)
     if issues:
-        for issue in issues:
-            print(f"[ProSim Warning] {issue}")
+        logger.warning("\n".join(f"[ProSim Warning] {issue}" for issue in issues))
         if strict:
-            critical = [
-                i for i in issues
-                if "no start node" in i.lower()
-                or "no end node" in i.lower()
-                or "orphaned" in i.lower()
-                or "not weakly connected" in i.lower()
-            ]
+            critical = [i for i in issues if _CRITICAL_RE.search(i)]
             if critical:
                 raise ValueError(
                     "Workflow generation produced invalid graph: " + "; ".join(critical)
@@ -6,23 +6,42 @@ energy drain (cost), and entropy (errors) in the workflow.
 
 from __future__ import annotations
 
+import numpy as np
+
 from prosim.simulation.results import BottleneckInfo, NodeMetrics, SimulationResults
 
 
+# Component weights and matching reasons for detect_bottlenecks, in column order
+_DETECT_WEIGHTS = np.array([0.35, 0.25, 0.20, 0.10, 0.10])
+_REASONS = (
+    "High time contribution",
+    "High utilization",
+    "High queue delay",
+    "High error rate",
+    "High cost",
+)
+
+
+def _column(node_metrics: list[NodeMetrics], attr: str) -> np.ndarray:
+    return np.fromiter((getattr(nm, attr) for nm in node_metrics), dtype=np.float64, count=len(node_metrics))
+
+
 def compute_bottleneck_scores(node_metrics: list[NodeMetrics], avg_total_time: float) -> None:
     """Compute bottleneck scores for all node metrics (mutates in place).
 
     Simplified inline scoring used by both simulation engines:
     score = 0.4 * time_contribution_pct + 0.3 * utilization + 0.3 * queue_time_pct
     """
-    total_time_contrib = sum(nm.total_time_contribution for nm in node_metrics)
-    for nm in node_metrics:
-        time_pct = nm.total_time_contribution / max(total_time_contrib, 1e-10)
-        nm.bottleneck_score = (
-            0.4 * time_pct
-            + 0.3 * nm.utilization
-            + 0.3 * (nm.queue_time / max(avg_total_time, 1e-10))
-        )
+    if not node_metrics:
+        return
+    contrib = _column(node_metrics, "total_time_contribution")
+    scores = (
+        0.4 * (contrib / max(contrib.sum(), 1e-10))
+        + 0.3 * _column(node_metrics, "utilization")
+        + 0.3 * (_column(node_metrics, "queue_time") / max(avg_total_time, 1e-10))
+    )
+    for nm, score in zip(node_metrics, scores.tolist()):
+        nm.bottleneck_score = score
 
 
 def detect_bottlenecks(
@@ -40,52 +59,48 @@ def detect_bottlenecks(
 
     Returns the top N bottleneck nodes ranked by score.
     """
-    if not results.node_metrics:
+    node_metrics = results.node_metrics
+    if not node_metrics:
         return []
 
-    total_time_contrib = sum(nm.total_time_contribution for nm in results.node_metrics)
-    total_cost = sum(nm.total_cost for nm in results.node_metrics)
-    max_queue = max((nm.queue_time for nm in results.node_metrics), default=1.0)
-
-    bottlenecks = []
-    for nm in results.node_metrics:
-        if nm.transactions_processed == 0:
-            continue
-
-        time_pct = nm.total_time_contribution / max(total_time_contrib, 1e-10)
-        cost_pct = nm.total_cost / max(total_cost, 1e-10)
-        queue_pct = nm.queue_time / max(max_queue, 1e-10)
-        error_rate = nm.transactions_errored / max(nm.transactions_processed, 1)
-
-        score = (
-            0.35 * time_pct
-            + 0.25 * nm.utilization
-            + 0.20 * queue_pct
-            + 0.10 * error_rate
-            + 0.10 * cost_pct
-        )
-
-        # Determine primary reason
-        components = {
-            "High time contribution": time_pct,
-            "High utilization": nm.utilization,
-            "High queue delay": queue_pct,
-            "High error rate": error_rate,
-            "High cost": cost_pct,
-        }
-        reason = max(components, key=components.get)  # type: ignore[arg-type]
-
-        bottlenecks.append(
-            BottleneckInfo(
-                node_id=nm.node_id,
-                node_name=nm.node_name,
-                score=round(score, 4),
-                reason=reason,
-                utilization=nm.utilization,
-                avg_queue_time=nm.queue_time,
-                time_contribution_pct=round(time_pct * 100, 2),
-            )
+    contrib = _column(node_metrics, "total_time_contribution")
+    total_cost = _column(node_metrics, "total_cost")
+    queue = _column(node_metrics, "queue_time")
+    utilization = _column(node_metrics, "utilization")
+    processed = _column(node_metrics, "transactions_processed")
+    errored = _column(node_metrics, "transactions_errored")
+
+    # One row per node, one column per score component
+    components = np.stack(
+        [
+            contrib / max(contrib.sum(), 1e-10),
+            utilization,
+            queue / max(queue.max(), 1e-10),
+            errored / np.maximum(processed, 1),
+            total_cost / max(total_cost.sum(), 1e-10),
+        ],
+        axis=1,
+    )
+    scores = np.round(components @ _DETECT_WEIGHTS, 4)
+    reason_idx = components.argmax(axis=1)
+
+    # Rank visited nodes by score (ties keep node order); partition first so
+    # only the top candidates are sorted
+    candidates = np.flatnonzero(processed != 0)
+    if 0 < top_n < candidates.size:
+        kth = np.partition(scores[candidates], candidates.size - top_n)[candidates.size - top_n]
+        candidates = candidates[scores[candidates] >= kth]
+    ranked = candidates[np.argsort(-scores[candidates], kind="stable")][:top_n]
+
+    return [
+        BottleneckInfo(
+            node_id=node_metrics[i].node_id,
+            node_name=node_metrics[i].node_name,
+            score=float(scores[i]),
+            reason=_REASONS[reason_idx[i]],
+            utilization=node_metrics[i].utilization,
+            avg_queue_time=node_metrics[i].queue_time,
+            time_contribution_pct=round(float(components[i, 0]) * 100, 2),
         )
-
-    bottlenecks.sort(key=lambda b: b.score, reverse=True)
-    return bottlenecks[:top_n]
+        for i in ranked.tolist()
+    ]
@@ -6,8 +6,10 @@ each path by its cumulative probability.
 
 from __future__ import annotations
 
+import numpy as np
+
+from prosim.graph.compiled import compile_workflow
 from prosim.graph.models import NodeType, WorkflowGraph
-from prosim.graph.operations import build_nx_graph, topological_execution_order
 from prosim.simulation.bottleneck import compute_bottleneck_scores
 from prosim.simulation.results import (
     BottleneckInfo,
@@ -29,113 +31,90 @@ def run_deterministic(
     - Expected cost = cost_per_transaction * visit_probability * (1 + error_rate * max_retries)
     - Visit probability = sum of incoming edge probabilities * parent visit probabilities
     """
-    G = build_nx_graph(workflow)
-    topo_order = topological_execution_order(workflow)
-
-    # Compute visit probability for each node
-    visit_prob: dict[str, float] = {}
-    for node_id in topo_order:
-        node = workflow.get_node(node_id)
-        if not node:
-            continue
-        if node.node_type == NodeType.START:
-            visit_prob[node_id] = 1.0
-        else:
-            incoming = workflow.get_incoming_edges(node_id)
-            prob = 0.0
-            for edge in incoming:
-                parent_prob = visit_prob.get(edge.source, 0.0)
-                prob += parent_prob * edge.probability
-            visit_prob[node_id] = prob
-
-    # Compute expected arrival time at each node (cumulative from start)
-    arrival_time: dict[str, float] = {}
-    node_metrics_map: dict[str, NodeMetrics] = {}
+    compiled = compile_workflow(workflow)
+    nodes = workflow.nodes
+    n_nodes = compiled.num_nodes
+    forward = compiled.forward
+    is_start = np.array([t == NodeType.START for t in compiled.node_types], dtype=bool)
+
+    # Per-node parameters as arrays (indexed like workflow.nodes)
+    def column(attr: str) -> np.ndarray:
+        return np.array([getattr(n.params, attr) for n in nodes], dtype=np.float64)
+
+    exec_mean = column("exec_time_mean")
+    queue_mean = column("queue_delay_mean")
+    error_rate = column("error_rate")
+    drop_rate = column("drop_off_rate")
+    max_retries = column("max_retries")
+    par_factor = column("parallelization_factor")
+    cost_per_tx = column("cost_per_transaction")
+    capacity = np.array([n.params.capacity_per_hour or 0.0 for n in nodes], dtype=np.float64)
+
+    # Expected time and cost at each node (including retries)
+    retry_factor = 1.0 + error_rate * max_retries
+    node_exec_time = (exec_mean + queue_mean) * retry_factor
+    effective_time = node_exec_time / np.maximum(par_factor, 1)
+    node_cost = cost_per_tx * retry_factor
+
+    # Propagate visit probability and expected arrival time level by level.
+    # Visit probability = sum of incoming edge probabilities * parent visit
+    # probabilities; arrival = probability-weighted average of parent
+    # completion times (arrival + own time). Start nodes are pinned to 1 / 0.
+    visit_prob = np.zeros(n_nodes)
+    arrival_time = np.zeros(n_nodes)
+    for group in compiled.level_groups:
+        rows = forward[group]
+        vp = rows @ visit_prob
+        weighted = rows @ (visit_prob * (arrival_time + effective_time))
+        visit_prob[group] = np.where(is_start[group], 1.0, vp)
+        arrival_time[group] = np.where(is_start[group], 0.0, weighted / np.maximum(vp, 1e-10))
+
+    # Effective throughput through each node
+    transactions_at_node = (config.num_transactions * visit_prob).astype(np.int64)
+    transactions_errored = (transactions_at_node * error_rate).astype(np.int64)
+    transactions_dropped = (transactions_at_node * drop_rate).astype(np.int64)
+    transactions_retried = np.where(max_retries >= 1, transactions_errored, 0)
+
+    # Utilization
+    has_capacity = capacity > 0
+    utilization = np.zeros(n_nodes)
+    utilization[has_capacity] = np.minimum(
+        config.volume_per_hour * visit_prob[has_capacity]
+        / (capacity[has_capacity] * par_factor[has_capacity]),
+        1.0,
+    )
 
-    for node_id in topo_order:
-        node = workflow.get_node(node_id)
-        if not node:
-            continue
-
-        p = node.params
-        vp = visit_prob.get(node_id, 0.0)
-
-        # Expected time at this node (including retries)
-        retry_factor = 1.0 + p.error_rate * p.max_retries
-        node_exec_time = (p.exec_time_mean + p.queue_delay_mean) * retry_factor
-        effective_time = node_exec_time / max(p.parallelization_factor, 1)
-
-        # Arrival time = max of all parent (arrival_time + their exec time)
-        if node.node_type == NodeType.START:
-            arrival_time[node_id] = 0.0
-        else:
-            incoming = workflow.get_incoming_edges(node_id)
-            if incoming:
-                # Weighted average of parent completion times
-                weighted_sum = 0.0
-                weight_sum = 0.0
-                for edge in incoming:
-                    parent_metrics = node_metrics_map.get(edge.source)
-                    if parent_metrics:
-                        parent_completion = arrival_time.get(edge.source, 0.0) + parent_metrics.avg_time
-                        w = visit_prob.get(edge.source, 0.0) * edge.probability
-                        weighted_sum += parent_completion * w
-                        weight_sum += w
-                arrival_time[node_id] = weighted_sum / max(weight_sum, 1e-10)
-            else:
-                arrival_time[node_id] = 0.0
-
-        # Cost at this node
-        node_cost = p.cost_per_transaction * retry_factor
-
-        # Effective throughput through this node
-        effective_drop = 1.0 - p.drop_off_rate
-        transactions_at_node = int(config.num_transactions * vp)
-        transactions_errored = int(transactions_at_node * p.error_rate)
-        transactions_dropped = int(transactions_at_node * p.drop_off_rate)
-        transactions_retried = int(transactions_errored * min(p.max_retries, 1))
-
-        # Utilization
-        if p.capacity_per_hour and p.capacity_per_hour > 0:
-            demand = config.volume_per_hour * vp
-            utilization = min(demand / (p.capacity_per_hour * p.parallelization_factor), 1.0)
-        else:
-            utilization = 0.0
-
-        nm = NodeMetrics(
-            node_id=node_id,
+    node_metrics_map: dict[str, NodeMetrics] = {}
+    for i in compiled.topo_order:
+        node = nodes[i]
+        t = float(effective_time[i])
+        node_metrics_map[node.id] = NodeMetrics(
+            node_id=node.id,
             node_name=node.name,
-            avg_time=effective_time,
-            p50_time=effective_time,
-            p95_time=effective_time * 1.3,  # Deterministic estimate
-            p99_time=effective_time * 1.6,
-            total_time_contribution=effective_time * vp,
-            avg_cost=node_cost,
-            total_cost=node_cost * transactions_at_node,
-            transactions_processed=transactions_at_node,
-            transactions_errored=transactions_errored,
-            transactions_dropped=transactions_dropped,
-            transactions_retried=transactions_retried,
-            utilization=utilization,
-            queue_time=p.queue_delay_mean,
+            avg_time=t,
+            p50_time=t,
+            p95_time=t * 1.3,  # Deterministic estimate
+            p99_time=t * 1.6,
+            total_time_contribution=t * float(visit_prob[i]),
+            avg_cost=float(node_cost[i]),
+            total_cost=float(node_cost[i] * transactions_at_node[i]),
+            transactions_processed=int(transactions_at_node[i]),
+            transactions_errored=int(transactions_errored[i]),
+            transactions_dropped=int(transactions_dropped[i]),
+            transactions_retried=int(transactions_retried[i]),
+            utilization=float(utilization[i]),
+            queue_time=node.params.queue_delay_mean,
         )
-        node_metrics_map[node_id] = nm
 
     # Compute aggregate metrics
     node_metrics_list = list(node_metrics_map.values())
 
     # Total time = expected completion time at end nodes
-    end_times = []
-    for node in workflow.get_end_nodes():
-        if node.id in arrival_time and node.id in node_metrics_map:
-            end_times.append(arrival_time[node.id] + node_metrics_map[node.id].avg_time)
-    avg_total_time = max(end_times) if end_times else 0.0
+    end_idx = compiled.end_idx
+    avg_total_time = float(np.max(arrival_time[end_idx] + effective_time[end_idx])) if end_idx.size else 0.0
 
     # Total cost = sum of node costs weighted by visit probability
-    avg_total_cost = sum(
-        nm.avg_cost * visit_prob.get(nm.node_id, 0.0)
-        for nm in node_metrics_list
-    )
+    avg_total_cost = float(np.dot(node_cost, visit_prob))
 
     # Throughput
     if avg_total_time > 0:
@@ -145,19 +124,16 @@ def run_deterministic(
 
     # Max throughput limited by bottleneck capacity
     max_throughput = throughput
-    for nm in node_metrics_list:
-        node = workflow.get_node(nm.node_id)
-        if node and node.params.capacity_per_hour:
-            vp = visit_prob.get(nm.node_id, 0.0)
-            if vp > 0:
-                node_max = node.params.capacity_per_hour * node.params.parallelization_factor / vp
-                max_throughput = min(max_throughput, node_max)
+    limiting = has_capacity & (visit_prob > 0)
+    if limiting.any():
+        node_max = capacity[limiting] * par_factor[limiting] / visit_prob[limiting]
+        max_throughput = min(max_throughput, float(node_max.min()))
 
     # Completed vs failed vs dropped
-    end_visit_prob = sum(visit_prob.get(n.id, 0.0) for n in workflow.get_end_nodes())
+    end_visit_prob = float(visit_prob[end_idx].sum())
     completed = int(config.num_transactions * end_visit_prob)
-    total_dropped = sum(nm.transactions_dropped for nm in node_metrics_list)
-    total_errored = sum(nm.transactions_errored for nm in node_metrics_list)
+    total_dropped = int(transactions_dropped.sum())
+    total_errored = int(transactions_errored.sum())
 
     # Compute bottleneck scores
     compute_bottleneck_scores(node_metrics_list, avg_total_time)
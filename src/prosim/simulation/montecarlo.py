@@ -6,11 +6,21 @@ with stochastic execution times, error occurrences, and branching decisions.
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 import numpy as np
 from numpy.random import Generator
 
+try:
+    import numba
+
+    _NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    numba = None
+    _NUMBA_AVAILABLE = False
+
+from prosim.graph.compiled import CompiledWorkflow, compile_workflow
 from prosim.graph.models import NodeType, WorkflowGraph
-from prosim.graph.operations import build_nx_graph
 from prosim.simulation.bottleneck import compute_bottleneck_scores
 from prosim.simulation.results import (
     NodeMetrics,
@@ -19,169 +29,437 @@ from prosim.simulation.results import (
 )
 
 
-def run_monte_carlo(
-    workflow: WorkflowGraph,
-    config: SimulationConfig,
-) -> SimulationResults:
-    """Run Monte Carlo simulation with stochastic transaction processing.
+# Max per-node time samples retained for percentile estimates. Percentiles
+# are exact while a node's visit count stays at or below this; beyond it
+# they are computed from a uniform reservoir sample.
+_SAMPLE_CAP = 10_000
 
-    Each transaction is simulated individually through the graph:
-    1. Start at start node
-    2. At each node, sample execution time from normal distribution
-    3. At decision nodes, sample branch based on probabilities
-    4. Track error/drop events per transaction
-    5. Aggregate results across all transactions
+# Node kind codes used by the array-based simulator
+_KIND_TASK = 0
+_KIND_END = 1
+_KIND_DECISION = 2
+
+
+@dataclass
+class _SimTables:
+    """Structure-of-arrays view of a workflow, indexed by node position.
+
+    Outgoing edges are stored CSR-style: the edges leaving node ``i`` are
+    ``out_target[out_ptr[i]:out_ptr[i + 1]]`` with matching normalized
+    cumulative branch probabilities in ``out_cumprob``.
+    Targets that do not reference a known node are encoded as ``-1``.
     """
-    rng = np.random.default_rng(config.seed)
-    num_tx = config.num_transactions
 
-    # Pre-compute node lookup and adjacency
-    node_map = {n.id: n for n in workflow.nodes}
-    outgoing_map: dict[str, list] = {}
-    for node in workflow.nodes:
-        outgoing_map[node.id] = workflow.get_outgoing_edges(node.id)
+    exec_mean: np.ndarray
+    exec_std: np.ndarray
+    queue_mean: np.ndarray
+    queue_std: np.ndarray
+    error_rate: np.ndarray
+    drop_rate: np.ndarray
+    retry_delay: np.ndarray
+    max_retries: np.ndarray
+    par_factor: np.ndarray
+    cost: np.ndarray
+    kind: np.ndarray
+    out_ptr: np.ndarray
+    out_target: np.ndarray
+    out_cumprob: np.ndarray
+
+
+def _build_tables(workflow: WorkflowGraph, compiled: CompiledWorkflow) -> _SimTables:
+    """Flatten node parameters into contiguous arrays alongside the compiled adjacency."""
+    nodes = workflow.nodes
+
+    def column(attr: str) -> np.ndarray:
+        return np.array([getattr(n.params, attr) for n in nodes], dtype=np.float64)
+
+    kind = np.array(
+        [
+            _KIND_END if node_type == NodeType.END
+            else _KIND_DECISION if node_type == NodeType.DECISION
+            else _KIND_TASK
+            for node_type in compiled.node_types
+        ],
+        dtype=np.int8,
+    )
+
+    return _SimTables(
+        exec_mean=column("exec_time_mean"),
+        exec_std=np.sqrt(column("exec_time_variance")),
+        queue_mean=column("queue_delay_mean"),
+        queue_std=np.sqrt(column("queue_delay_variance")),
+        error_rate=column("error_rate"),
+        drop_rate=column("drop_off_rate"),
+        retry_delay=column("retry_delay"),
+        max_retries=np.array([n.params.max_retries for n in nodes], dtype=np.int64),
+        par_factor=np.maximum(column("parallelization_factor"), 1.0),
+        cost=column("cost_per_transaction"),
+        kind=kind,
+        out_ptr=compiled.out_ptr,
+        out_target=compiled.out_target,
+        out_cumprob=compiled.out_cumprob,
+    )
+
+
+@dataclass
+class _RunArrays:
+    """Raw per-transaction and per-node tallies produced by a simulation backend."""
+
+    tx_times: np.ndarray
+    tx_costs: np.ndarray
+    tx_completed: np.ndarray
+    node_visits: np.ndarray
+    node_errors: np.ndarray
+    node_drops: np.ndarray
+    node_retries: np.ndarray
+    node_time_sum: np.ndarray
+    node_cost_sum: np.ndarray
+    node_samples: list[np.ndarray]
 
-    # Per-node accumulators
-    node_times: dict[str, list[float]] = {n.id: [] for n in workflow.nodes}
-    node_costs: dict[str, list[float]] = {n.id: [] for n in workflow.nodes}
-    node_visits: dict[str, int] = {n.id: 0 for n in workflow.nodes}
-    node_errors: dict[str, int] = {n.id: 0 for n in workflow.nodes}
-    node_drops: dict[str, int] = {n.id: 0 for n in workflow.nodes}
-    node_retries: dict[str, int] = {n.id: 0 for n in workflow.nodes}
+
+def _sample_time(rng: Generator, mean: float, std: float, n: int) -> np.ndarray:
+    """Draw ``n`` truncated-normal (min 0) durations, or the constant mean if std is 0."""
+    if std > 0:
+        return np.maximum(0.0, rng.normal(mean, std, n))
+    return np.full(n, mean)
+
+
+def _reservoir_insert(
+    rng: Generator, row: np.ndarray, seen: int, values: np.ndarray
+) -> None:
+    """Feed ``values`` into a fixed-size reservoir ``row`` that has already seen ``seen`` items.
+
+    Equivalent to running Algorithm R over ``values`` in order: slots are
+    filled directly until the row is full, after which item ``k`` replaces a
+    random slot with probability ``cap / (k + 1)``.
+    """
+    cap = row.size
+    n_fill = min(max(cap - seen, 0), values.size)
+    if n_fill:
+        row[seen:seen + n_fill] = values[:n_fill]
+    rest = values[n_fill:]
+    if rest.size:
+        k = np.arange(seen + n_fill, seen + values.size)
+        slots = rng.integers(0, k + 1)
+        keep = slots < cap
+        row[slots[keep]] = rest[keep]
+
+
+def _simulate_cohorts(
+    t: _SimTables, start_idx: int, num_tx: int, max_hops: int, seed: int | None
+) -> _RunArrays:
+    """Pure-NumPy backend: advance all transactions in per-node cohorts."""
+    rng = np.random.default_rng(seed)
+    n_nodes = t.exec_mean.size
+
+    # Per-node accumulators. Time samples go into one fixed-size reservoir
+    # row per node; node_visits doubles as the write cursor into that row.
+    sample_cap = min(max(num_tx, 1), _SAMPLE_CAP)
+    times_buf = np.empty((n_nodes, sample_cap), dtype=np.float64)
+    node_time_sum = np.zeros(n_nodes, dtype=np.float64)
+    node_cost_sum = np.zeros(n_nodes, dtype=np.float64)
+    node_visits = np.zeros(n_nodes, dtype=np.int64)
+    node_errors = np.zeros(n_nodes, dtype=np.int64)
+    node_drops = np.zeros(n_nodes, dtype=np.int64)
+    node_retries = np.zeros(n_nodes, dtype=np.int64)
 
     # Transaction-level results
     tx_times = np.zeros(num_tx, dtype=np.float64)
     tx_costs = np.zeros(num_tx, dtype=np.float64)
     tx_completed = np.zeros(num_tx, dtype=bool)
 
-    start_nodes = workflow.get_start_nodes()
-    if not start_nodes:
-        return _empty_results(workflow, config)
-
-    start_id = start_nodes[0].id
-
-    # Simulate each transaction
-    for i in range(num_tx):
-        current_id = start_id
-        total_time = 0.0
-        total_cost = 0.0
-        dropped = False
-        max_hops = len(workflow.nodes) * 10  # Safety limit for loops
-
-        hops = 0
-        while current_id and hops < max_hops:
-            hops += 1
-            node = node_map.get(current_id)
-            if not node:
-                break
-
-            p = node.params
-            node_visits[current_id] += 1
-
-            # Sample execution time (truncated normal, min 0)
-            if p.exec_time_variance > 0:
-                std = p.exec_time_variance ** 0.5
-                exec_time = max(0.0, rng.normal(p.exec_time_mean, std))
-            else:
-                exec_time = p.exec_time_mean
-
-            # Sample queue delay
-            if p.queue_delay_variance > 0:
-                std_q = p.queue_delay_variance ** 0.5
-                queue_time = max(0.0, rng.normal(p.queue_delay_mean, std_q))
-            else:
-                queue_time = p.queue_delay_mean
-
-            # Apply parallelization
-            effective_time = (exec_time + queue_time) / max(p.parallelization_factor, 1)
-
-            # Check for error
-            retries_used = 0
-            if p.error_rate > 0 and rng.random() < p.error_rate:
-                node_errors[current_id] += 1
-                # Retry logic
-                for retry in range(p.max_retries):
-                    retries_used += 1
-                    effective_time += p.retry_delay
-                    if p.exec_time_variance > 0:
-                        effective_time += max(0.0, rng.normal(p.exec_time_mean, std))
-                    else:
-                        effective_time += p.exec_time_mean
-                    if rng.random() >= p.error_rate:
-                        break  # Retry succeeded
-                node_retries[current_id] += retries_used
-
-            # Check for drop-off
-            if p.drop_off_rate > 0 and rng.random() < p.drop_off_rate:
-                node_drops[current_id] += 1
-                dropped = True
+    # Current node of every transaction; `active` holds in-flight transaction ids
+    position = np.full(num_tx, start_idx, dtype=np.int64)
+    active = np.arange(num_tx)
+
+    for _ in range(max_hops):
+        if active.size == 0:
+            break
+
+        # Group in-flight transactions by current node
+        order = np.argsort(position[active], kind="stable")
+        active = active[order]
+        at_node = position[active]
+        group_nodes, group_starts = np.unique(at_node, return_index=True)
+        group_bounds = np.append(group_starts, active.size)
+
+        advancing: list[np.ndarray] = []
+        for g, i in enumerate(group_nodes):
+            ids = active[group_bounds[g]:group_bounds[g + 1]]
+            n = ids.size
+            cursor = node_visits[i]
+            node_visits[i] += n
+
+            # Sample execution and queue time, then apply parallelization
+            exec_time = _sample_time(rng, t.exec_mean[i], t.exec_std[i], n)
+            queue_time = _sample_time(rng, t.queue_mean[i], t.queue_std[i], n)
+            effective_time = (exec_time + queue_time) / t.par_factor[i]
+
+            # Errors, with retries until success or max_retries
+            retries_used = np.zeros(n, dtype=np.int64)
+            error_rate = t.error_rate[i]
+            if error_rate > 0:
+                errored = np.flatnonzero(rng.random(n) < error_rate)
+                node_errors[i] += errored.size
+                pending = errored
+                for _retry in range(t.max_retries[i]):
+                    if pending.size == 0:
+                        break
+                    retries_used[pending] += 1
+                    effective_time[pending] += t.retry_delay[i] + _sample_time(
+                        rng, t.exec_mean[i], t.exec_std[i], pending.size
+                    )
+                    pending = pending[rng.random(pending.size) < error_rate]
+                node_retries[i] += int(retries_used.sum())
+
+            # Drop-off
+            survivors = ids
+            if t.drop_rate[i] > 0:
+                dropped = rng.random(n) < t.drop_rate[i]
+                node_drops[i] += int(dropped.sum())
+                survivors = ids[~dropped]
 
             # Accumulate
-            node_times[current_id].append(effective_time)
-            node_costs[current_id].append(p.cost_per_transaction * (1 + retries_used))
-            total_time += effective_time
-            total_cost += p.cost_per_transaction * (1 + retries_used)
+            cost = t.cost[i] * (1 + retries_used)
+            if cursor + n <= sample_cap:
+                times_buf[i, cursor:cursor + n] = effective_time
+            else:
+                _reservoir_insert(rng, times_buf[i], cursor, effective_time)
+            node_time_sum[i] += effective_time.sum()
+            node_cost_sum[i] += cost.sum()
+            tx_times[ids] += effective_time
+            tx_costs[ids] += cost
 
-            if dropped:
-                break
+            if survivors.size == 0:
+                continue
 
             # End node reached
-            if node.node_type == NodeType.END:
-                tx_completed[i] = True
-                break
+            if t.kind[i] == _KIND_END:
+                tx_completed[survivors] = True
+                continue
 
             # Navigate to next node
-            edges = outgoing_map.get(current_id, [])
-            if not edges:
-                break
-
-            if node.node_type == NodeType.DECISION:
-                # Probabilistic branching
-                probs = np.array([e.probability for e in edges])
-                if probs.sum() > 0:
-                    probs = probs / probs.sum()
-                    choice = rng.choice(len(edges), p=probs)
-                    current_id = edges[choice].target
-                else:
-                    current_id = edges[0].target
-            elif node.node_type == NodeType.PARALLEL_GATEWAY:
-                # For parallel gateway, take the max time of all branches
-                # Simplified: follow each branch, sum max
-                # For now, follow the first edge (parallel handling in deterministic)
-                current_id = edges[0].target
+            lo, hi = t.out_ptr[i], t.out_ptr[i + 1]
+            if lo == hi:
+                continue
+
+            if t.kind[i] == _KIND_DECISION and hi - lo > 1:
+                # Probabilistic branching via inverse-CDF lookup
+                cum = t.out_cumprob[lo:hi]
+                choice = np.searchsorted(cum, rng.random(survivors.size), side="right")
+                targets = t.out_target[lo + np.minimum(choice, hi - lo - 1)]
             else:
-                # Follow the single outgoing edge (or first if multiple)
-                current_id = edges[0].target
+                # Follow the single outgoing edge (or first if multiple).
+                # Parallel gateways also follow the first edge for now
+                # (parallel handling lives in the deterministic engine).
+                targets = np.full(survivors.size, t.out_target[lo])
+
+            known = targets >= 0
+            position[survivors[known]] = targets[known]
+            advancing.append(survivors[known])
+
+        active = np.concatenate(advancing) if advancing else active[:0]
+
+    node_samples = [times_buf[i, : min(node_visits[i], sample_cap)] for i in range(n_nodes)]
+    return _RunArrays(
+        tx_times=tx_times,
+        tx_costs=tx_costs,
+        tx_completed=tx_completed,
+        node_visits=node_visits,
+        node_errors=node_errors,
+        node_drops=node_drops,
+        node_retries=node_retries,
+        node_time_sum=node_time_sum,
+        node_cost_sum=node_cost_sum,
+        node_samples=node_samples,
+    )
+
+
+if _NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True)
+    def _simulate_tx_numba(
+        start_idx, exec_mean, exec_std, queue_mean, queue_std, error_rate, drop_rate,
+        retry_delay, max_retries, par_factor, cost_per_tx, node_kind,
+        out_ptr, out_target, out_cumprob, seed, num_tx, max_hops, sample_cap,
+    ):  # pragma: no cover - compiled
+        """Walk each transaction through the graph one at a time in native code.
+
+        Per-node time samples are kept in a ``(n_nodes, sample_cap)`` buffer;
+        once a node has more visits than ``sample_cap`` the row is maintained
+        as a uniform reservoir sample.
+        """
+        np.random.seed(seed)
+        n_nodes = exec_mean.shape[0]
+
+        tx_times = np.zeros(num_tx)
+        tx_costs = np.zeros(num_tx)
+        tx_completed = np.zeros(num_tx, dtype=np.bool_)
+        node_visits = np.zeros(n_nodes, dtype=np.int64)
+        node_errors = np.zeros(n_nodes, dtype=np.int64)
+        node_drops = np.zeros(n_nodes, dtype=np.int64)
+        node_retries = np.zeros(n_nodes, dtype=np.int64)
+        node_time_sum = np.zeros(n_nodes)
+        node_cost_sum = np.zeros(n_nodes)
+        samples = np.empty((n_nodes, sample_cap))
+
+        for tx in range(num_tx):
+            cur = start_idx
+            for _hop in range(max_hops):
+                k = node_visits[cur]
+                node_visits[cur] = k + 1
+
+                exec_time = exec_mean[cur]
+                if exec_std[cur] > 0:
+                    exec_time = max(0.0, np.random.normal(exec_mean[cur], exec_std[cur]))
+                queue_time = queue_mean[cur]
+                if queue_std[cur] > 0:
+                    queue_time = max(0.0, np.random.normal(queue_mean[cur], queue_std[cur]))
+                effective_time = (exec_time + queue_time) / par_factor[cur]
+
+                retries = 0
+                if error_rate[cur] > 0 and np.random.random() < error_rate[cur]:
+                    node_errors[cur] += 1
+                    while retries < max_retries[cur]:
+                        retries += 1
+                        retry_time = exec_mean[cur]
+                        if exec_std[cur] > 0:
+                            retry_time = max(0.0, np.random.normal(exec_mean[cur], exec_std[cur]))
+                        effective_time += retry_delay[cur] + retry_time
+                        if np.random.random() >= error_rate[cur]:
+                            break
+                    node_retries[cur] += retries
+
+                dropped = drop_rate[cur] > 0 and np.random.random() < drop_rate[cur]
+                if dropped:
+                    node_drops[cur] += 1
+
+                cost = cost_per_tx[cur] * (1 + retries)
+                if k < sample_cap:
+                    samples[cur, k] = effective_time
+                else:
+                    j = np.random.randint(0, k + 1)
+                    if j < sample_cap:
+                        samples[cur, j] = effective_time
+                node_time_sum[cur] += effective_time
+                node_cost_sum[cur] += cost
+                tx_times[tx] += effective_time
+                tx_costs[tx] += cost
+
+                if dropped:
+                    break
+                if node_kind[cur] == _KIND_END:
+                    tx_completed[tx] = True
+                    break
+
+                lo = out_ptr[cur]
+                hi = out_ptr[cur + 1]
+                if lo == hi:
+                    break
+                nxt = out_target[lo]
+                if node_kind[cur] == _KIND_DECISION and hi - lo > 1:
+                    u = np.random.random()
+                    for e in range(lo, hi):
+                        if u < out_cumprob[e]:
+                            nxt = out_target[e]
+                            break
+                if nxt < 0:
+                    break
+                cur = nxt
+
+        return (
+            tx_times, tx_costs, tx_completed, node_visits, node_errors, node_drops,
+            node_retries, node_time_sum, node_cost_sum, samples,
+        )
+
+
+def _simulate_numba(
+    t: _SimTables, start_idx: int, num_tx: int, max_hops: int, seed: int | None
+) -> _RunArrays:
+    """Numba backend: per-transaction walk compiled to native code."""
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    sample_cap = min(max(num_tx, 1), _SAMPLE_CAP)
+    (
+        tx_times, tx_costs, tx_completed, node_visits, node_errors, node_drops,
+        node_retries, node_time_sum, node_cost_sum, samples,
+    ) = _simulate_tx_numba(
+        start_idx, t.exec_mean, t.exec_std, t.queue_mean, t.queue_std, t.error_rate,
+        t.drop_rate, t.retry_delay, t.max_retries, t.par_factor, t.cost, t.kind,
+        t.out_ptr, t.out_target, t.out_cumprob, seed, num_tx, max_hops, sample_cap,
+    )
+    node_samples = [
+        samples[i, : min(int(node_visits[i]), sample_cap)] for i in range(node_visits.size)
+    ]
+    return _RunArrays(
+        tx_times=tx_times,
+        tx_costs=tx_costs,
+        tx_completed=tx_completed,
+        node_visits=node_visits,
+        node_errors=node_errors,
+        node_drops=node_drops,
+        node_retries=node_retries,
+        node_time_sum=node_time_sum,
+        node_cost_sum=node_cost_sum,
+        node_samples=node_samples,
+    )
+
+
+def run_monte_carlo(
+    workflow: WorkflowGraph,
+    config: SimulationConfig,
+) -> SimulationResults:
+    """Run Monte Carlo simulation with stochastic transaction processing.
+
+    Each transaction is simulated individually through the graph:
+    1. Start at start node
+    2. At each node, sample execution time from normal distribution
+    3. At decision nodes, sample branch based on probabilities
+    4. Track error/drop events per transaction
+    5. Aggregate results across all transactions
+
+    When numba is installed the walk runs as a compiled per-transaction
+    kernel; otherwise transactions advance in lock-step cohorts, with all
+    in-flight transactions at the same node processed in one batch of
+    vectorized draws. Both backends are reproducible for a fixed seed but
+    draw from different random streams.
+    """
+    num_tx = config.num_transactions
+
+    compiled = compile_workflow(workflow)
+    if compiled.start_idx.size == 0:
+        return _empty_results(workflow, config)
+
+    nodes = workflow.nodes
+    t = _build_tables(workflow, compiled)
+    start_idx = int(compiled.start_idx[0])
+    max_hops = len(nodes) * 10  # Safety limit for loops
 
-        tx_times[i] = total_time
-        tx_costs[i] = total_cost
+    simulate = _simulate_numba if _NUMBA_AVAILABLE else _simulate_cohorts
+    run = simulate(t, start_idx, num_tx, max_hops, config.seed)
 
     # Aggregate results
-    completed_mask = tx_completed
-    completed_times = tx_times[completed_mask] if completed_mask.any() else tx_times
-    completed_costs = tx_costs[completed_mask] if completed_mask.any() else tx_costs
+    completed_mask = run.tx_completed
+    completed_times = run.tx_times[completed_mask] if completed_mask.any() else run.tx_times
+    completed_costs = run.tx_costs[completed_mask] if completed_mask.any() else run.tx_costs
 
     avg_total_time = float(np.mean(completed_times)) if len(completed_times) > 0 else 0.0
     avg_total_cost = float(np.mean(completed_costs)) if len(completed_costs) > 0 else 0.0
 
     # Per-node metrics
-    total_time_contrib_sum = 0.0
     node_metrics_list = []
-    for node in workflow.nodes:
+    for i, node in enumerate(nodes):
         nid = node.id
-        times = node_times[nid]
-        costs = node_costs[nid]
+        visits = int(run.node_visits[i])
 
-        if times:
-            t_arr = np.array(times)
-            c_arr = np.array(costs)
-            avg_t = float(np.mean(t_arr))
-            contrib = avg_t * (node_visits[nid] / max(num_tx, 1))
-            total_time_contrib_sum += contrib
+        if visits:
+            t_arr = run.node_samples[i]
+            avg_t = float(run.node_time_sum[i] / visits)
+            contrib = avg_t * (visits / max(num_tx, 1))
 
             # Utilization estimate
             if node.params.capacity_per_hour and node.params.capacity_per_hour > 0:
-                demand = config.volume_per_hour * (node_visits[nid] / max(num_tx, 1))
+                demand = config.volume_per_hour * (visits / max(num_tx, 1))
                 utilization = min(demand / (node.params.capacity_per_hour * node.params.parallelization_factor), 1.0)
             else:
                 utilization = 0.0
@@ -194,12 +472,12 @@ def run_monte_carlo(
                 p95_time=float(np.percentile(t_arr, 95)),
                 p99_time=float(np.percentile(t_arr, 99)),
                 total_time_contribution=contrib,
-                avg_cost=float(np.mean(c_arr)),
-                total_cost=float(np.sum(c_arr)),
-                transactions_processed=node_visits[nid],
-                transactions_errored=node_errors[nid],
-                transactions_dropped=node_drops[nid],
-                transactions_retried=node_retries[nid],
+                avg_cost=float(run.node_cost_sum[i] / visits),
+                total_cost=float(run.node_cost_sum[i]),
+                transactions_processed=visits,
+                transactions_errored=int(run.node_errors[i]),
+                transactions_dropped=int(run.node_drops[i]),
+                transactions_retried=int(run.node_retries[i]),
                 utilization=utilization,
                 queue_time=node.params.queue_delay_mean,
             )
@@ -218,7 +496,7 @@ def run_monte_carlo(
         workflow_name=workflow.name,
         total_transactions=num_tx,
         completed_transactions=int(completed_mask.sum()),
-        failed_transactions=sum(node_errors.values()),
+        failed_transactions=int(run.node_errors.sum()),
         dropped_transactions=int((~completed_mask).sum()),
         avg_total_time=avg_total_time,
         p50_total_time=float(np.percentile(completed_times, 50)) if len(completed_times) > 0 else 0.0,
@@ -227,7 +505,7 @@ def run_monte_carlo(
         min_total_time=float(np.min(completed_times)) if len(completed_times) > 0 else 0.0,
         max_total_time=float(np.max(completed_times)) if len(completed_times) > 0 else 0.0,
         avg_total_cost=avg_total_cost,
-        total_cost=float(np.sum(tx_costs)),
+        total_cost=float(np.sum(run.tx_costs)),
         throughput_per_hour=throughput,
         max_throughput_per_hour=throughput,
         node_metrics=node_metrics_list,
@@ -0,0 +1,67 @@
+"""Tests for the compiled workflow topology."""
+
+import numpy as np
+
+from prosim.graph.compiled import compile_workflow
+from prosim.graph.models import Edge
+
+
+def test_compile_linear(linear_workflow):
+    compiled = compile_workflow(linear_workflow)
+
+    assert compiled.node_ids == ("start", "validate", "process", "end")
+    assert [compiled.node_ids[i] for i in compiled.topo_order] == ["start", "validate", "process", "end"]
+    assert compiled.start_idx.tolist() == [0]
+    assert compiled.end_idx.tolist() == [3]
+    assert compiled.out_ptr.tolist() == [0, 1, 2, 3, 3]
+    assert compiled.in_ptr.tolist() == [0, 0, 1, 2, 3]
+
+
+def test_compile_branching_csr(branching_workflow):
+    compiled = compile_workflow(branching_workflow)
+    decide = compiled.index["decide"]
+
+    lo, hi = compiled.out_ptr[decide], compiled.out_ptr[decide + 1]
+    targets = [compiled.node_ids[i] for i in compiled.out_target[lo:hi]]
+    assert targets == ["approve", "reject"]
+    np.testing.assert_allclose(compiled.out_prob[lo:hi], [0.7, 0.3])
+
+
+def test_compile_is_cached_across_param_changes(linear_workflow):
+    first = compile_workflow(linear_workflow)
+    linear_workflow.nodes[1].params.exec_time_mean = 99.0
+    assert compile_workflow(linear_workflow) is first
+
+
+def test_compile_picks_up_structural_edits(linear_workflow):
+    first = compile_workflow(linear_workflow)
+    linear_workflow.edges.append(Edge(source="validate", target="end"))
+    second = compile_workflow(linear_workflow)
+
+    assert second is not first
+    assert second.out_ptr[-1] == 4
+
+
+def test_compiled_arrays_are_read_only(linear_workflow):
+    compiled = compile_workflow(linear_workflow)
+    assert not compiled.out_target.flags.writeable
+    assert not compiled.topo_order.flags.writeable
+
+
+def test_compile_level_groups(branching_workflow):
+    compiled = compile_workflow(branching_workflow)
+    levels = [sorted(compiled.node_ids[i] for i in group) for group in compiled.level_groups]
+
+    assert levels == [["start"], ["review"], ["decide"], ["approve", "reject"], ["end"]]
+    decide, approve = compiled.index["decide"], compiled.index["approve"]
+    assert compiled.forward[approve, decide] == 0.7
+
+
+def test_compile_cumulative_branch_probabilities(branching_workflow):
+    branching_workflow.edges[2].probability = 0.35  # unnormalized 0.35 / 0.15 split
+    branching_workflow.edges[3].probability = 0.15
+    compiled = compile_workflow(branching_workflow)
+    decide = compiled.index["decide"]
+
+    lo, hi = compiled.out_ptr[decide], compiled.out_ptr[decide + 1]
+    np.testing.assert_allclose(compiled.out_cumprob[lo:hi], [0.7, 1.0])
@@ -1,5 +1,7 @@
 """Tests for postprocess_raw_workflow: empty edges, orphaned nodes, repair, strict mode."""
 
+import json
+
 import pytest
 
 from prosim.graph.models import NodeType, WorkflowGraph
@@ -198,7 +200,7 @@ def test_postprocess_connectivity_repair():
     assert not any("not weakly connected" in i.lower() for i in issues)
 
 
-def test_postprocess_non_strict_logs_warnings():
+def test_postprocess_non_strict_logs_warnings(caplog):
     """Non-strict mode logs warnings but returns workflow."""
     raw = {
         "name": "Warn",
@@ -210,8 +212,55 @@ def test_postprocess_non_strict_logs_warnings():
         "edges": [],
     }
     # No start/end - repair can't infer. Strict would raise; non-strict returns with issues
-    wf = postprocess_raw_workflow(raw, strict=False)
+    with caplog.at_level("WARNING", logger="prosim.parser.postprocess"):
+        wf = postprocess_raw_workflow(raw, strict=False)
     assert wf is not None
     assert len(wf.edges) == 0  # no repair possible
+    assert len(caplog.records) == 1  # all issues batched into a single record
+    assert "[ProSim Warning]" in caplog.text
     issues = validate_graph(wf)
     assert any("no start" in i.lower() or "orphaned" in i.lower() for i in issues)
+
+
+def test_postprocess_applies_type_default_times():
+    """Missing exec_time_mean falls back to the node-type default; other params keep model defaults."""
+    raw = {
+        "name": "Defaults",
+        "nodes": [
+            {"id": "start", "name": "Start", "node_type": "start"},
+            {"id": "review", "name": "Review", "node_type": "human", "error_rate": 0.1},
+            {"id": "end", "name": "End", "node_type": "end"},
+        ],
+        "edges": [],
+    }
+    wf = postprocess_raw_workflow(raw)
+    review = wf.get_node("review")
+    assert review.params.exec_time_mean == 300.0
+    assert review.params.error_rate == 0.1
+    assert review.params.exec_time_variance == 0.1
+    assert wf.get_node("start").params.exec_time_mean == 0.0
+
+
+def test_postprocess_accepts_json_payload():
+    """A JSON string goes through the same validation pass as a dict."""
+    raw = {
+        "name": "Json",
+        "nodes": _raw_linear_nodes(),
+        "edges": [
+            {"source": "start", "target": "validate"},
+            {"source": "validate", "target": "end", "probability": 1.0},
+        ],
+    }
+    wf = postprocess_raw_workflow(json.dumps(raw))
+    assert wf.model_dump() == postprocess_raw_workflow(raw).model_dump()
+
+
+def test_postprocess_rejects_invalid_node_params():
+    """Out-of-range parameters are rejected as ValueError (pydantic ValidationError)."""
+    raw = {
+        "name": "Bad",
+        "nodes": [{"id": "a", "name": "A", "node_type": "api", "error_rate": 2.0}],
+        "edges": [],
+    }
+    with pytest.raises(ValueError):
+        postprocess_raw_workflow(raw)
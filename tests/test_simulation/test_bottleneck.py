@@ -45,3 +45,19 @@ def test_bottleneck_has_reason(branching_workflow):
     for bn in bottlenecks:
         assert bn.reason != ""
         assert bn.score >= 0
+
+
+def test_detect_bottlenecks_ties_keep_node_order():
+    from prosim.simulation.results import NodeMetrics, SimulationResults
+
+    node_metrics = [
+        NodeMetrics(node_id=f"n{i}", node_name=f"N{i}", total_time_contribution=1.0, transactions_processed=10)
+        for i in range(6)
+    ]
+    node_metrics.append(NodeMetrics(node_id="idle", node_name="Idle", total_time_contribution=5.0))
+    results = SimulationResults(config=SimulationConfig(), workflow_name="Ties", node_metrics=node_metrics)
+
+    bottlenecks = detect_bottlenecks(results, top_n=3)
+    # Unvisited nodes are skipped; equal scores keep their original order
+    assert [b.node_id for b in bottlenecks] == ["n0", "n1", "n2"]
+    assert all(b.reason == "High time contribution" for b in bottlenecks)
@@ -1,5 +1,7 @@
 """Tests for deterministic simulation engine."""
 
+import pytest
+
 from prosim.simulation.deterministic import run_deterministic
 from prosim.simulation.results import SimulationConfig, SimulationMode
 
@@ -60,3 +62,17 @@ def test_deterministic_retry_overhead(linear_workflow):
     # With error_rate=0.02 and max_retries=2, there's a retry factor
     # avg_time should be > exec_time_mean due to retry overhead
     assert validate_metrics.avg_time >= linear_workflow.get_node("validate").params.exec_time_mean
+
+
+def test_deterministic_capacity_limits_max_throughput(branching_workflow):
+    review = branching_workflow.get_node("review")
+    review.params.capacity_per_hour = 4.0
+    review.params.parallelization_factor = 2
+    approve = branching_workflow.get_node("approve")
+    approve.params.capacity_per_hour = 3.0
+
+    config = SimulationConfig(mode=SimulationMode.DETERMINISTIC, num_transactions=1000)
+    results = run_deterministic(branching_workflow, config)
+
+    # review: 4 * 2 / 1.0 = 8/h; approve: 3 / 0.7 ~= 4.29/h
+    assert results.max_throughput_per_hour == pytest.approx(3.0 / 0.7)
@@ -1,5 +1,8 @@
 """Tests for Monte Carlo simulation engine."""
 
+import pytest
+
+from prosim.graph.models import Edge, EdgeType, Node, NodeParams, NodeType, WorkflowGraph
 from prosim.simulation.montecarlo import run_monte_carlo
 from prosim.simulation.results import SimulationConfig, SimulationMode
 
@@ -76,3 +79,77 @@ def test_monte_carlo_percentiles(linear_workflow):
     assert results.p99_total_time >= results.p95_total_time
     assert results.min_total_time <= results.p50_total_time
     assert results.max_total_time >= results.p99_total_time
+
+
+def test_monte_carlo_branch_split_follows_probabilities(branching_workflow):
+    config = SimulationConfig(mode=SimulationMode.MONTE_CARLO, num_transactions=20000, seed=7)
+    results = run_monte_carlo(branching_workflow, config)
+
+    approve = results.get_node_metrics("approve").transactions_processed
+    reject = results.get_node_metrics("reject").transactions_processed
+    assert approve / (approve + reject) == pytest.approx(0.7, abs=0.02)
+    # Every routed transaction reaches the end node
+    assert results.get_node_metrics("end").transactions_processed == approve + reject
+
+
+def test_monte_carlo_backends_agree(branching_workflow, monkeypatch):
+    import prosim.simulation.montecarlo as mc
+
+    config = SimulationConfig(mode=SimulationMode.MONTE_CARLO, num_transactions=20000, seed=3)
+    monkeypatch.setattr(mc, "_NUMBA_AVAILABLE", False)
+    numpy_results = run_monte_carlo(branching_workflow, config)
+    if not hasattr(mc, "_simulate_tx_numba"):
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(mc, "_NUMBA_AVAILABLE", True)
+    numba_results = run_monte_carlo(branching_workflow, config)
+
+    assert numba_results.avg_total_time == pytest.approx(numpy_results.avg_total_time, rel=0.02)
+    assert numba_results.failed_transactions == pytest.approx(numpy_results.failed_transactions, rel=0.15)
+    assert numba_results.completed_transactions == config.num_transactions
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_monte_carlo_rework_loop_revisits_nodes(use_numba, monkeypatch):
+    import prosim.simulation.montecarlo as mc
+
+    if use_numba and not hasattr(mc, "_simulate_tx_numba"):
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(mc, "_NUMBA_AVAILABLE", use_numba)
+    workflow = WorkflowGraph(
+        name="Rework",
+        nodes=[
+            Node(id="start", name="Start", node_type=NodeType.START, params=NodeParams(exec_time_mean=0.0)),
+            Node(id="work", name="Work", node_type=NodeType.HUMAN, params=NodeParams(exec_time_mean=10.0)),
+            Node(id="check", name="Check", node_type=NodeType.DECISION, params=NodeParams(exec_time_mean=0.0)),
+            Node(id="end", name="End", node_type=NodeType.END, params=NodeParams(exec_time_mean=0.0)),
+        ],
+        edges=[
+            Edge(source="start", target="work"),
+            Edge(source="work", target="check"),
+            Edge(source="check", target="work", probability=0.5, edge_type=EdgeType.LOOP),
+            Edge(source="check", target="end", probability=0.5, edge_type=EdgeType.CONDITIONAL),
+        ],
+    )
+    config = SimulationConfig(mode=SimulationMode.MONTE_CARLO, num_transactions=2000, seed=11)
+    results = run_monte_carlo(workflow, config)
+
+    work = results.get_node_metrics("work")
+    # Geometric number of passes with mean 2
+    assert work.transactions_processed / config.num_transactions == pytest.approx(2.0, rel=0.1)
+    assert work.p50_time == pytest.approx(10.0, rel=0.05)
+
+
+def test_reservoir_insert_keeps_uniform_sample():
+    import numpy as np
+
+    from prosim.simulation.montecarlo import _reservoir_insert
+
+    rng = np.random.default_rng(0)
+    row = np.empty(2000)
+    seen = 0
+    for chunk in np.array_split(np.arange(100_000, dtype=float), 37):
+        _reservoir_insert(rng, row, seen, chunk)
+        seen += chunk.size
+
+    assert np.median(row) == pytest.approx(50_000, rel=0.05)
+    assert np.percentile(row, 95) == pytest.approx(95_000, rel=0.02)